@@ -12,80 +12,99 @@
     era_from_ut1_iso(ut1_iso) -> ERA in radians [0, 2*pi)
     proj_angle_lonlat(lon_deg, lat_deg) -> angle (radians) of lab projection wrt ECEF x-axis in [0, 2*pi)
     total_angle_mod(ut1_iso, lon_deg, lat_deg) -> (sum_rad, sum_deg)
+    era_from_ut1_iso_array(ut1_iso_arr) -> era[N] in radians [0, 2*pi)
+    proj_angle_lonlat_array(lon_deg_arr, lat_deg_arr) -> proj[N] in radians [0, 2*pi)
+    total_angle_mod_array(ut1_iso_arr, lon_deg_arr, lat_deg_arr) -> (sum_rad[N], sum_deg[N], era[N], proj[N]), sum_rad in [0, 2*pi)
+    total_angle_mod_grid(ut1_iso_arr, lon_deg_arr, lat_deg_arr) -> (sum_rad, sum_deg, era[N_t], proj[N_lab]), sum_rad shape (N_t, N_lab) in [0, 2*pi)
 """
 
 from datetime import datetime
+from functools import lru_cache
 import math
 
+# ERA 多项式常数（IAU 2000）：ERA = 2*pi * frac(_ERA_C0 + _ERA_C1 * D + day_fraction)
+_TWO_PI = math.tau
+_DEG2RAD = math.pi / 180.0
+_ERA_C0 = 0.7790572732640
+_ERA_C1 = 0.00273781191135448
+# _ERA_C1 拆成高/低两部分：_ERA_C1_HI 只有 24 位有效位，与 |D| < 2**19 的半整数天数相乘无舍入，
+# 可精确取其小数部分；_ERA_C1_LO * D 很小，舍入误差可忽略。D 很大时 f 仍保持完整双精度。
+# _ERA_C1_LO 取 0.00273781191135448 - _ERA_C1_HI 的十进制精确值（而非 _ERA_C1 - _ERA_C1_HI，
+# 否则 _ERA_C1 本身的二进制表示误差会被 D 放大）
+_ERA_C1_HI = 11758813.0 / 2**32
+_ERA_C1_LO = -8.804100969268798828125e-11
+# 日内每天转过的圈数（ERA 对 UT1 严格线性）：D 中的 df 与末项 df 合并为 (1 + _ERA_C1)*df
+_ERA_DAY_RATE = 1.0 + _ERA_C1
+
 # ---------- 辅助：解析 ISO 并计算儒略日（JD） ----------
 def parse_iso_to_datetime(iso_str):
     """
     解析 ISO 字符串到 datetime（假定其字段为 UT1，不做时区转换）。
     支持 'YYYY-MM-DDTHH:MM:SS', 带小数秒, 或带空格分隔的形式；若带 'Z' 则去掉。
     """
-    s = iso_str.strip()
-    if s.endswith('Z'):
-        s = s[:-1]
-    # Try fromisoformat (支持小数秒)
+    s = iso_str.strip().removesuffix('Z')
+    # 快速路径：fromisoformat（C 实现，支持小数秒与空格分隔）
+    try:
+        return datetime.fromisoformat(s)
+    except ValueError:
+        pass
+    # 回退到格式化解析（非补零的月/日，如 "2025-8-17T12:00:00"；没有小数秒）
     try:
-        dt = datetime.fromisoformat(s)
-        return dt
-    except Exception:
-        # 回退到格式化解析（没有小数秒）
-        try:
-            dt = datetime.strptime(s, "%Y-%m-%dT%H:%M:%S")
-            return dt
-        except Exception as e:
-            raise ValueError(f"无法解析时间字符串: {iso_str}") from e
+        return datetime.strptime(s, "%Y-%m-%dT%H:%M:%S")
+    except ValueError as e:
+        raise ValueError(f"无法解析时间字符串: {iso_str}") from e
 
 def jd_from_datetime(dt):
     """
     计算儒略日 JD（假定 dt 为 UT1）.
-    使用 Meeus 算法，包含日内小数部分。
+    使用 Fliegel–Van Flandern 整数算法求儒略日数（格里历），再加日内小数部分。
     返回 float JD.
     """
-    year = dt.year
-    month = dt.month
-    day = dt.day
     # day fraction from time
     day_frac = (dt.hour + dt.minute/60.0 + (dt.second + dt.microsecond*1e-6)/3600.0) / 24.0
 
-    if month <= 2:
-        year -= 1
-        month += 12
-
-    A = year // 100
-    B = 2 - A + A // 4
-    # For Gregorian calendar dates (after 1582)
-    jd = int(365.25 * (year + 4716)) + int(30.6001 * (month + 1)) + day + B - 1524.5 + day_frac
+    # 纯整数运算，无分支（1、2 月通过 a=1 归入上一年）
+    a = (14 - dt.month) // 12
+    y = dt.year + 4800 - a
+    m = dt.month + 12 * a - 3
+    jdn = dt.day + (153 * m + 2) // 5 + 365 * y + y // 4 - y // 100 + y // 400 - 32045
+    jd = jdn - 0.5 + day_frac
     return jd
 
 # ---------- 计算 ERA ----------
+@lru_cache(maxsize=1024)
+def _era_rev_for_date(year, month, day):
+    """
+    当日 0h UT1 的 ERA 转数 _ERA_C0 + frac(_ERA_C1 * D0)，D0 = JD(0h) - 2451545.0；
+    _ERA_C1*D0 按高/低两部分计算，高位部分只保留其小数部分。同一日期重复查询时直接命中缓存。
+    """
+    D0 = jd_from_datetime(datetime(year, month, day)) - 2451545.0
+    hi = _ERA_C1_HI * D0
+    return _ERA_C0 + (hi - int(hi)) + _ERA_C1_LO * D0
+
 def era_from_ut1_iso(ut1_iso):
     """
     Compute Earth Rotation Angle (ERA) in radians from UT1 ISO string.
     Using IAU 2000/2006 definition:
       ERA = 2*pi * frac(0.7790572732640 + 0.00273781191135448 * D + fractional_day)
       where D = JD_UT1 - 2451545.0
+    JD 以两部分参与计算（当日 0h 的 JD + 日内小数），与 astropy Time 的 jd1/jd2
+    双精度对等价，不会因把 JD 合成单个 float 而丢失低位；
+    批量计算请用 era_from_ut1_iso_array（直接使用 jd1/jd2）。
     返回值：ERA (radians), 范围 [0, 2*pi)
     """
     dt = parse_iso_to_datetime(ut1_iso)
-    jd = jd_from_datetime(dt)
-    D = jd - 2451545.0
-    # fractional day (UT1 day fraction)
-    frac_day = (jd + 0.5 - math.floor(jd + 0.5))  # 另一种方式；更直接使用 day fraction:
-    # 上面可改为用时间直接算 day fraction:
-    # Compute day fraction explicitly to avoid ambiguity:
-    day_fraction = (dt.hour + dt.minute/60.0 + (dt.second + dt.microsecond*1e-6)/3600.0) / 24.0
-
-    # ERA fractional revolutions
-    f = 0.7790572732640 + 0.00273781191135448 * D + day_fraction
-    # take fractional part
-    f_frac = f - math.floor(f)
-    era = 2.0 * math.pi * f_frac
-    # normalize
-    era = era % (2.0 * math.pi)
-    return era
+    # 当日 0h UT1 的 JD 与日内小数部分分开计算，D = D0 + df
+    df = (dt.hour*3600 + dt.minute*60 + dt.second + dt.microsecond*1e-6) / 86400.0
+
+    # ERA fractional revolutions: _ERA_C0 + _ERA_C1*D + df
+    #   = [_ERA_C0 + _ERA_C1*D0]（按日期缓存） + (1 + _ERA_C1)*df
+    f = _era_rev_for_date(dt.year, dt.month, dt.day) + _ERA_DAY_RATE * df
+    # take fractional part: modf 与 f 同号，f < 0 时补 1
+    f_frac = math.modf(f)[0]
+    if f_frac < 0.0:
+        f_frac += 1.0
+    return _TWO_PI * f_frac
 
 # ---------- 实验室投影角度 ----------
 def proj_angle_lonlat(lon_deg, lat_deg):
@@ -98,19 +117,14 @@ def proj_angle_lonlat(lon_deg, lat_deg):
       angle in radians in [0, 2*pi).
     说明：
       ECEF 单位向量（球面近似）： x = cosφ cosλ, y = cosφ sinλ, z = sinφ
-      投影到赤道面后向量 (x, y, 0); 对 x 轴的极角为 atan2(y, x).
-      atan2 返回 (-pi, pi], 转为 [0, 2pi).
-    """
-    lon = math.radians(lon_deg)
-    lat = math.radians(lat_deg)
-    coslat = math.cos(lat)
-    x = coslat * math.cos(lon)
-    y = coslat * math.sin(lon)
-    # proj angle relative to ECEF x axis:
-    ang = math.atan2(y, x)  # range (-pi, pi]
-    if ang < 0.0:
-        ang += 2.0 * math.pi
-    return ang
+      投影到赤道面后向量 (x, y, 0); 对 x 轴的极角 atan2(y, x) 按定义即为 λ，
+      因此直接取 λ mod 2pi，无需三角函数。
+      仅当 cosφ < 0（|φ| > 90°，非物理输入）时投影反向，角度为 λ + pi。
+    """
+    ang = lon_deg * _DEG2RAD
+    if math.cos(lat_deg * _DEG2RAD) < 0.0:
+        ang += math.pi
+    return ang % _TWO_PI
 
 # ---------- 主合成函数 ----------
 def total_angle_mod(ut1_iso, lon_deg, lat_deg):
@@ -120,10 +134,71 @@ def total_angle_mod(ut1_iso, lon_deg, lat_deg):
     """
     era = era_from_ut1_iso(ut1_iso)
     proj = proj_angle_lonlat(lon_deg, lat_deg)
-    s = era + proj
-    s_mod = s % (2.0 * math.pi)
+    # era, proj 均 >= 0，fmod 即精确取余，无需 % 的符号处理
+    s_mod = math.fmod(era + proj, _TWO_PI)
     return s_mod, math.degrees(s_mod), era, proj
 
+# ---------- 批量（NumPy）版本 ----------
+# numpy / astropy 仅在批量函数内部导入，标量路径（era_from_ut1_iso、total_angle_mod 等）保持只依赖标准库
+def era_from_ut1_iso_array(ut1_iso_arr):
+    """
+    era_from_ut1_iso 的批量版本：一次解析全部 ISO 字符串，用 NumPy 计算 ERA 数组。
+    使用 astropy Time 的 jd1/jd2 双精度对（jd1 为整数日，jd2 in [-0.5, 0.5]），
+    避免把 JD 合成单个 float 时丢失低位。
+    输入约定与 parse_iso_to_datetime 相同：去掉首尾空白与末尾 'Z'（字段视为 UT1），
+    日期与时间之间可用 'T' 或空格分隔。
+    返回值：ERA (radians) 数组, 范围 [0, 2*pi)
+    """
+    import numpy as np
+    from astropy.time import Time
+
+    iso = np.asarray(ut1_iso_arr, dtype=str)
+    iso = np.array([s.strip().removesuffix('Z').replace(' ', 'T', 1) for s in iso.ravel()],
+                   dtype=str).reshape(iso.shape)
+    t = Time(iso, format='isot', scale='ut1')
+    jd1, jd2 = t.jd1, t.jd2
+    # D = D_int + jd2，D_int 为整数天；_ERA_C1*D_int 与标量版本一样按高/低两部分计算
+    D_int = jd1 - 2451545.0
+    hi = _ERA_C1_HI * D_int
+    df = (jd2 + 0.5) % 1.0
+    f = _ERA_C0 + (hi - np.trunc(hi)) + _ERA_C1_LO * D_int + _ERA_C1 * jd2 + df
+    return _TWO_PI * (f % 1.0)
+
+def proj_angle_lonlat_array(lon_deg_arr, lat_deg_arr):
+    """
+    proj_angle_lonlat 的批量版本，返回 [0, 2*pi) 内的角度数组。
+    """
+    import numpy as np
+
+    ang = np.deg2rad(np.asarray(lon_deg_arr, dtype=float))
+    ang = np.where(np.cos(np.deg2rad(np.asarray(lat_deg_arr, dtype=float))) < 0.0, ang + np.pi, ang)
+    return ang % _TWO_PI
+
+def total_angle_mod_array(ut1_iso_arr, lon_deg_arr, lat_deg_arr):
+    """
+    total_angle_mod 的批量版本，三个输入按元素对应（可广播）。
+    返回 (sum_rad, sum_deg, era, proj)，均为 NumPy 数组，sum_rad in [0,2pi).
+    """
+    import numpy as np
+
+    era = era_from_ut1_iso_array(ut1_iso_arr)
+    proj = proj_angle_lonlat_array(lon_deg_arr, lat_deg_arr)
+    s_mod = (era + proj) % _TWO_PI
+    return s_mod, np.rad2deg(s_mod), era, proj
+
+def total_angle_mod_grid(ut1_iso_arr, lon_deg_arr, lat_deg_arr):
+    """
+    多个时刻 x 多个实验室：ut1_iso_arr 长度 N_t，lon_deg_arr/lat_deg_arr 长度 N_lab。
+    ERA 与投影角各算一次并连续存放，再广播相加取模。
+    返回 (sum_rad, sum_deg, era, proj)，sum_rad 形状 (N_t, N_lab)，in [0,2pi).
+    """
+    import numpy as np
+
+    eras = np.ascontiguousarray(era_from_ut1_iso_array(ut1_iso_arr), dtype=np.float64)
+    lons = np.ascontiguousarray(proj_angle_lonlat_array(lon_deg_arr, lat_deg_arr), dtype=np.float64)
+    s_mod = (eras[:, None] + lons[None, :]) % _TWO_PI
+    return s_mod, np.rad2deg(s_mod), eras, lons
+
 # ---------- 测试 / 示例 ----------
 if __name__ == "__main__":
     # 示例输入
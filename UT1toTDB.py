@@ -1,20 +1,36 @@
 from astropy.time import Time
+from astropy.utils.iers import IERS_Auto
 
-# 假设你知道 UT1 时间字符串和 DUT1 已内置（Astropy 可用 'ut1'）
-# 如果你有 UT1 时间：
-t_ut1 = Time("2025-08-17T12:00:00", scale='ut1')  # 需确保 astropy 可以解析该 ut1 时间
-# 把 UT1 转为 UTC（Astropy 会处理 DUT1/leap second，如果本地安装了 IERS 数据）
-t_utc = t_ut1.utc
+# 导入时一次性加载 IERS 表（DUT1 = UT1-UTC），避免首次 UT1 转换时在调用路径中读取/解析表格；
+# 之后的 Time 转换会复用 IERS_Auto 已缓存的同一张表
+_IERS = IERS_Auto.open()
 
-# 或者若你只有 UT1 并需要先减 DUT1 (手工):
-# dut1 = 0.1234  # seconds, 从 IERS 获取
-# t_utc = Time(t_ut1.iso) - dut1*u.s
 
-# 由 UTC -> TAI -> TT
-t_tt = t_utc.tt
+def ut1_to_tt_astropy(ut1_iso):
+    """
+    UT1 -> TT（Astropy 通过 IERS 表处理 DUT1/闰秒：UT1 -> UTC -> TAI -> TT）。
+    ut1_iso 可以是单个 ISO 字符串，也可以是字符串列表/数组；
+    需要成千上万次转换时请一次传入数组，而不是循环逐个调用。
+    """
+    return Time(ut1_iso, format='isot', scale='ut1').tt
 
-# TT -> TDB
-t_tdb = t_tt.tdb
 
-print("TDB:", t_tdb.iso)
-print("TDB - TT (s):", (t_tdb - t_tt).to('s'))
\ No newline at end of file
+def ut1_to_tdb_astropy(ut1_iso):
+    """
+    UT1 -> TDB，经由 ut1_to_tt_astropy。输入约定同上。
+    """
+    return ut1_to_tt_astropy(ut1_iso).tdb
+
+
+if __name__ == "__main__":
+    # 假设你知道 UT1 时间字符串和 DUT1 已内置（Astropy 可用 'ut1'）
+    # 或者若你只有 UT1 并需要先减 DUT1 (手工):
+    # dut1 = 0.1234  # seconds, 从 IERS 获取
+    # t_utc = Time(t_ut1.iso) - dut1*u.s
+    t_tt = ut1_to_tt_astropy("2025-08-17T12:00:00")
+
+    # TT -> TDB
+    t_tdb = t_tt.tdb
+
+    print("TDB:", t_tdb.iso)
+    print("TDB - TT (s):", (t_tdb - t_tt).to('s'))
\ No newline at end of file
@@ -8,24 +8,110 @@
   python VelocityEarthwrtSunICRS_tdb.py "2025-08-17T12:01:09.110" de440
 
 如果不提供参数，将使用默认时间和 ephemeris（de440）。
-依赖：astropy, numpy
+依赖：astropy, numpy, jplephem（JPL 行星历，如 de440）
 安装（如果未安装）：
-  pip install astropy numpy
+  pip install astropy numpy jplephem
 """
 
 from astropy.time import Time
 from astropy.coordinates import solar_system_ephemeris, get_body_barycentric_posvel
+from astropy.utils.data import download_file
 import astropy.units as u
 import numpy as np
+from functools import lru_cache
+import math
+import os
+import re
 import sys
 
 
-def earth_velocity_wrt_sun_icrs_kms_tdb(time_tdb_iso: str, ephem: str = "de440"):
+# 预先组合好的速度单位，避免每次调用重新构造 u.km / u.s
+_KMS = u.km / u.s
+
+# JPL 内核中的链：SSB->地月质心 (0,3) + 地月质心->地球 (3,399)；SSB->太阳 (0,10)
+_EARTH_CHAIN = ((0, 3), (3, 399))
+_SUN_CHAIN = ((0, 10),)
+
+
+@lru_cache(maxsize=None)
+def _open_kernel(ephem: str):
+    """
+    按名称打开并缓存 JPL 内核（jplephem SPK），与 solar_system_ephemeris 的全局内核相互独立。
+    名称解析与 astropy 一致："jpl" -> 默认 JPL 星历，"deNNN[s]" -> NAIF 下载地址（astropy 缓存），
+    其余视为本地文件路径或 URL。
     """
-    计算地球相对于太阳的速度向量（单位 km/s），输入时间为 TDB（Barycentric Dynamical Time）ISO 字符串。
+    from jplephem.spk import SPK
+
+    name = ephem.lower()
+    if name == "jpl":
+        name = "de430"
+    if re.fullmatch(r"de[0-9]{3}s?", name):
+        url = f"https://naif.jpl.nasa.gov/pub/naif/generic_kernels/spk/planets/{name}.bsp"
+        return SPK.open(download_file(url, cache=True))
+    if os.path.isfile(ephem):
+        return SPK.open(ephem)
+    return SPK.open(download_file(ephem, cache=True))
+
+
+def _kernel_for(ephem: str):
+    """
+    返回 ephem 对应的 JPL 内核；"builtin" 返回 None。
+    ephem 恰为 astropy 当前激活的行星历时复用其已打开的内核；否则使用本模块按名称缓存的内核，
+    不调用 solar_system_ephemeris.get_kernel（它会关闭并替换全局共享的内核）。
+    """
+    if ephem.lower() == "builtin":
+        return None
+    if ephem == solar_system_ephemeris.get():
+        return solar_system_ephemeris.kernel
+    return _open_kernel(ephem)
+
+
+def _kernel_velocity_km_per_day(kernel, chain, jd1, jd2):
+    """沿 chain 累加各段 jplephem 内核的速度（km/day），jd1/jd2 为 TDB 两部分 JD。"""
+    v = 0.0
+    for pair in chain:
+        spk = kernel[pair]
+        if spk.data_type == 3:
+            # Type 3 内核直接给出位置与速度
+            v = v + spk.compute(jd1, jd2)[3:]
+        else:
+            v = v + spk.compute_and_differentiate(jd1, jd2)[1]
+    return v
+
+
+def _earth_wrt_sun_velocity_kms(t: Time, ephem: str):
+    """
+    地球相对于太阳的速度，形状 (3,) + t.shape 的 ndarray（km/s）。
+    JPL 行星历直接对 ephem 对应的 jplephem 内核求 Chebyshev 导数，
+    跳过 get_body_barycentric_posvel 的分派与 Quantity/CartesianRepresentation 包装；
+    内核由 _kernel_for(ephem) 取得：与全局激活行星历相同时复用 astropy 的内核，
+    否则使用本模块的缓存，不会关闭或替换 solar_system_ephemeris 的全局内核。
+    "builtin" 没有 JPL 内核，仍走 get_body_barycentric_posvel（显式传入 ephemeris=ephem）。
+    """
+    kernel = _kernel_for(ephem)
+    if kernel is None:
+        _, v_e = get_body_barycentric_posvel("earth", t, ephemeris=ephem)
+        _, v_s = get_body_barycentric_posvel("sun", t, ephemeris=ephem)
+        return (v_e - v_s).xyz.to_value(_KMS)
+
+    t_tdb = t.tdb
+    jd1, jd2 = t_tdb.jd1, t_tdb.jd2
+    shape = getattr(jd1, "shape", ())
+    if len(shape) > 1:
+        # jplephem 只接受标量或一维 JD；与 astropy 相同，先展平再把结果还原成 (3,) + shape
+        jd1, jd2 = jd1.ravel(), jd2.ravel()
+    v = (_kernel_velocity_km_per_day(kernel, _EARTH_CHAIN, jd1, jd2)
+         - _kernel_velocity_km_per_day(kernel, _SUN_CHAIN, jd1, jd2))
+    return v.reshape((3,) + shape) / 86400.0
+
+
+def earth_velocity_wrt_sun_icrs_kms(iso: str, scale: str = "tt", ephem: str = "de440"):
+    """
+    计算地球相对于太阳的速度向量（单位 km/s），TT/TDB 等输入共用的统一入口。
 
     参数：
-      time_tdb_iso: TDB 的 ISO 时间字符串，例如 "2025-08-17T12:01:09.110"
+      iso: ISO 时间字符串，例如 "2025-08-17T12:01:09.110"（日期与时间之间也可用空格分隔）
+      scale: iso 的时间尺度（"tt"、"tdb" 等 astropy 支持的尺度），默认 "tt"；非 TDB 时在内部转换为 TDB
       ephem: JPL 行星历名称，默认 "de440"
 
     返回：
@@ -33,25 +119,34 @@ def earth_velocity_wrt_sun_icrs_kms_tdb(time_tdb_iso: str, ephem: str = "de440")
       speed: 浮点数，速度幅值（km/s）
     """
     # 解析时间（显式指定 format="isot" 能更稳定地解析 ISO 时间，包括小数秒）
-    try:
-        t = Time(time_tdb_iso, format="isot", scale="tdb")
-    except Exception:
-        # 作为后备，尝试自动解析（不指定 format）
-        t = Time(time_tdb_iso, scale="tdb")
+    # 到 TDB 的转换在 _earth_wrt_sun_velocity_kms 中统一进行；
+    # 先把空格分隔的 ISO 形式规范为 'T'，仍只需一次 format="isot" 解析
+    t = Time(iso.strip().replace(' ', 'T', 1), format="isot", scale=scale)
+    return earth_velocity_wrt_sun_icrs_kms_tdb_t(t, ephem=ephem)
+
+
+def earth_velocity_wrt_sun_icrs_kms_tdb(time_tdb_iso: str, ephem: str = "de440"):
+    """
+    输入时间为 TDB（Barycentric Dynamical Time）ISO 字符串，例如 "2025-08-17T12:01:09.110"。
+    等价于 earth_velocity_wrt_sun_icrs_kms(time_tdb_iso, scale="tdb", ephem=ephem)。
+    """
+    return earth_velocity_wrt_sun_icrs_kms(time_tdb_iso, scale="tdb", ephem=ephem)
 
-    # 设置行星历
-    solar_system_ephemeris.set(ephem)
 
-    # 获取地球与太阳相对于太阳系质心的速度矢量（BCRS/ICRS 表示）
-    pos_e, v_earth = get_body_barycentric_posvel("earth", t)
-    pos_s, v_sun = get_body_barycentric_posvel("sun", t)
+def earth_velocity_wrt_sun_icrs_kms_tdb_t(t: Time, ephem: str = "de440"):
+    """
+    与 earth_velocity_wrt_sun_icrs_kms_tdb 相同，但直接接受已构造好的 Time 对象，跳过 ISO 字符串解析。
 
-    # 地球相对于太阳的速度（带单位的 Quantity 三分量）
-    v_rel = v_earth - v_sun
-    v_kms = v_rel.xyz.to(u.km / u.s)  # Quantity array with 3 elements
+    参数：
+      t: astropy Time 对象（任意时间尺度，astropy 内部会转换到 TDB）
+      ephem: JPL 行星历名称，默认 "de440"
 
-    vec = np.array([v_kms[0].value, v_kms[1].value, v_kms[2].value], dtype=float)
-    speed = float(np.linalg.norm(vec))
+    返回：
+      vec, speed（同 earth_velocity_wrt_sun_icrs_kms_tdb）
+    """
+    # 地球相对于太阳的速度（BCRS/ICRS 表示），形状 (3,) 的 ndarray
+    vec = _earth_wrt_sun_velocity_kms(t, ephem)
+    speed = math.sqrt(vec[0]*vec[0] + vec[1]*vec[1] + vec[2]*vec[2])
 
     return vec, speed
 
@@ -59,19 +154,31 @@ def earth_velocity_wrt_sun_icrs_kms_tdb(time_tdb_iso: str, ephem: str = "de440")
 def earth_velocity_wrt_sun_icrs_kms_tt_convert(time_tt_iso: str, ephem: str = "de440"):
     """
     备用函数：接受 TT 输入、在内部转换为 TDB，然后计算速度（单位 km/s）。
-    保留以便兼容原脚本注释和使用习惯。
+    保留以便兼容原脚本注释和使用习惯；等价于 earth_velocity_wrt_sun_icrs_kms(time_tt_iso, scale="tt", ephem=ephem)。
     """
-    # 解析为 TT
-    try:
-        t_tt = Time(time_tt_iso, format="isot", scale="tt")
-    except Exception:
-        t_tt = Time(time_tt_iso, scale="tt")
+    return earth_velocity_wrt_sun_icrs_kms(time_tt_iso, scale="tt", ephem=ephem)
+
+
+def earth_velocity_wrt_sun_icrs_kms_tt_batch(iso_list, ephem: str = "de440"):
+    """
+    批量版本：接受一组 TT 的 ISO 时间字符串，一次构造 Time 数组并只调用两次星历计算。
+
+    参数：
+      iso_list: TT 的 ISO 时间字符串一维序列，例如 ["2025-08-17T12:00:00", ...]；
+                单个字符串或多维数组会按 np.ravel 展平为长度 N 的一维序列
+      ephem: JPL 行星历名称，默认 "de440"
+
+    返回：
+      vecs: numpy 数组，形状 (N, 3) -> 每行 [vx, vy, vz]（单位 km/s）
+      speeds: numpy 数组，形状 (N,)，速度幅值（km/s）
+    """
+    iso = [s.strip().replace(' ', 'T', 1) for s in np.ravel(np.asarray(iso_list, dtype=str))]
+    t = Time(iso, format="isot", scale="tt")
 
-    # 转为 TDB
-    t_tdb = t_tt.tdb
+    # (3, N) 的普通 ndarray，避免逐元素生成 Quantity
+    v = _earth_wrt_sun_velocity_kms(t, ephem)
 
-    # 之后与 earth_velocity_wrt_sun_icrs_kms_tdb 相同逻辑
-    return earth_velocity_wrt_sun_icrs_kms_tdb(t_tdb.isot, ephem=ephem)
+    return v.T, np.sqrt(np.einsum('ij,ij->j', v, v))
 
 
 def main():
@@ -82,17 +189,12 @@ def main():
     time_input = sys.argv[1] if len(sys.argv) > 1 else default_time
     ephem = sys.argv[2] if len(sys.argv) > 2 else default_ephem
 
-    # 默认为输入为 TDB。如果你想传入 TT 并在内部转换，请使用 earth_velocity_wrt_sun_icrs_kms_tt_convert。
+    # 输入为 TDB。如果你想传入 TT，请使用 earth_velocity_wrt_sun_icrs_kms(..., scale="tt")。
     try:
-        vec, speed = earth_velocity_wrt_sun_icrs_kms_tdb(time_input, ephem=ephem)
+        vec, speed = earth_velocity_wrt_sun_icrs_kms(time_input, scale="tdb", ephem=ephem)
     except Exception as e:
         print("Error computing ephemeris with TDB input:", e)
-        # 作为回退，如果用户可能给的是 TT 时间，则尝试 TT->TDB 转换路径
-        try:
-            vec, speed = earth_velocity_wrt_sun_icrs_kms_tt_convert(time_input, ephem=ephem)
-        except Exception as e2:
-            print("Also failed converting from TT:", e2)
-            sys.exit(1)
+        sys.exit(1)
 
     print(f"TDB: {time_input}, ephem: {ephem}")
     print(f"vx, vy, vz (km/s): {vec[0]:.9f}, {vec[1]:.9f}, {vec[2]:.9f}")